@@ -73,12 +73,12 @@ def demo_workflow():
     entries = fixtex.parse_bibtex_file("example.bib")
     print(f"   Found {len(entries)} entries:")
     for entry in entries:
-        title = entry.get('title', 'No title').strip('{}')
+        title = fixtex.clean_latex(entry.get('title', 'No title'))
         print(f"   - {entry['ID']}: {title[:50]}...")
     print()
     
     print("2. For each entry, the tool will:")
-    print("   a. Build search query from title/author")
+    print("   a. Build search query from title, first author and year")
     print("   b. Search Google Scholar")
     print("   c. Click 'All N versions' link")
     print("   d. Extract info for each version (title, venue, snippet)")
@@ -120,6 +120,12 @@ def demo_advanced_options():
     print("Non-headless mode (see browser):")
     print("  python fixtex.py input.bib --no-headless")
     print()
+    print("Number of parallel browsers:")
+    print("  python fixtex.py input.bib -w 2")
+    print()
+    print("Show every search and LLM request:")
+    print("  python fixtex.py input.bib -v")
+    print()
     print("Complete example:")
     print("  python fixtex.py papers.bib -o papers_clean.bib -s acm --no-headless")
     print()
@@ -8,12 +8,28 @@ the citation.
 """
 
 import argparse
+import collections
+import difflib
+import hashlib
+import html
+import itertools
+import json
+import logging
 import os
+import random
 import re
+import sqlite3
 import sys
+import threading
 import time
-from typing import List, Dict, Optional
+import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
+from urllib.parse import quote_plus
 
 import bibtexparser
 from bibtexparser.bparser import BibTexParser
@@ -22,19 +38,307 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from dotenv import load_dotenv
+from tqdm import tqdm
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger('fixtex')
+
+SCHOLAR_URL = "https://scholar.google.com"
+
+# Longest title used in a query, and longest query Scholar handles reliably
+MAX_TITLE_LENGTH = 200
+MAX_QUERY_LENGTH = 256
+
+# LaTeX commands and accents with a single argument, such as \emph{...} or \'{e}
+LATEX_COMMAND_RE = re.compile(r'\\(?:[a-zA-Z]+\*?|[\'"^`~=.])\s*\{([^{}]*)\}')
+
+# Remaining markup: bare accents (\'e), backslashes of argument-less commands ({\L}) and braces
+LATEX_MARKUP_RE = re.compile(r'\\[\'"^`~=.]|\\(?=[a-zA-Z])|[{}]')
+
+# Escaped special characters (\&), and dashes and non-breaking spaces (-- and ~)
+LATEX_ESCAPE_RE = re.compile(r'\\([&%$#_])')
+LATEX_SPACING_RE = re.compile(r'-{2,3}|~')
+
+# Characters that must be escaped in plain text put into BibTeX, the inverse of LATEX_ESCAPE_RE
+LATEX_SPECIAL_RE = re.compile(r'([&%$#_])')
+
+# Seconds to wait for a Scholar page to render, and for the user to solve a
+# CAPTCHA in a visible browser
+SCHOLAR_WAIT_TIMEOUT = 15
+CAPTCHA_SOLVE_TIMEOUT = 120
+
+# Result list (possibly empty) and CAPTCHA challenges of Scholar and google.com/sorry
+SCHOLAR_RESULTS_SELECTOR = '.gs_ri, #gs_res_ccl_mid'
+SCHOLAR_CAPTCHA_SELECTOR = '#gs_captcha_ccl, #captcha-form'
+
+# Finds the first result on a Scholar page and its "All N versions" link
+FIRST_RESULT_SCRIPT = """
+const result = document.querySelector('.gs_ri');
+const link = result && Array.from(result.querySelectorAll('.gs_fl a'))
+    .find(a => a.textContent.toLowerCase().includes('version'));
+return {
+    result: result,
+    versions_text: link ? link.textContent : null,
+    versions_url: link ? link.href : null
+};
+"""
+
+# Maximum number of versions of a paper shown to the LLM
+MAX_VERSIONS = 10
+
+# Extracts title, publication info and snippet of the first N results on a
+# Scholar page; results without a title or publication info are skipped
+VERSIONS_INFO_SCRIPT = """
+return Array.from(document.querySelectorAll('.gs_ri')).slice(0, arguments[0]).map((r, i) => ({
+    index: i,
+    title: (r.querySelector('.gs_rt') || {}).innerText || '',
+    info: (r.querySelector('.gs_a') || {}).innerText || '',
+    snippet: (r.querySelector('.gs_rs') || {}).innerText || ''
+})).filter(v => v.title && v.info);
+"""
+
+# Minimum number of seconds between two Google Scholar page loads, plus up to
+# SCHOLAR_REQUEST_JITTER random seconds
+SCHOLAR_REQUEST_INTERVAL = 3.0
+SCHOLAR_REQUEST_JITTER = 1.0
+
+# Crossref works search, number of hits compared with the entry, and how similar
+# (0-1) a hit's title must be to the entry's title to be used
+CROSSREF_URL = "https://api.crossref.org/works"
+CROSSREF_ROWS = 5
+CROSSREF_MIN_TITLE_SIMILARITY = 0.9
+CROSSREF_TIMEOUT = 15
+
+# BibTeX entry types of Crossref work types, most reputable first; other types are not used
+CROSSREF_ENTRY_TYPES = {
+    'journal-article': 'article',
+    'proceedings-article': 'inproceedings',
+    'book-chapter': 'incollection',
+    'book': 'book',
+    'monograph': 'book',
+    'edited-book': 'book',
+    'report': 'techreport',
+    'dissertation': 'phdthesis',
+    'posted-content': 'misc',
+}
+
+# JATS/HTML tags Crossref leaves in titles, such as <i>...</i>
+CROSSREF_MARKUP_RE = re.compile(r'<[^>]+>')
+
+# Socket of the daemon keeping browsers running between runs, the number of browsers
+# it starts (overridden by the SCRAPER_POOLING_MIN_SIZE environment variable), and
+# how often (in seconds) it checks they still respond
+DAEMON_SOCKET_PATH = Path.home() / '.fixtex' / 'sock'
+SCRAPER_POOLING_MIN_SIZE = 2
+DAEMON_HEALTH_CHECK_INTERVAL = 60
+
+# Location and lifetime of the on-disk cache of citations and LLM responses
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'fixtex' / 'cache.sqlite'
+SCHOLAR_CACHE_TTL_DAYS = 365
+
+# Timeout in seconds for OpenRouter requests
+LLM_TIMEOUT = 30
+
+# Number of entries reformatted per LLM request
+LLM_BATCH_SIZE = 10
+
+# Number of LLM requests sent concurrently
+LLM_WORKERS = 4
+
+# Characters that delimit top-level blocks in a .bib file
+BIBTEX_DELIMITER_RE = re.compile(r'[@{}()]')
+
+# Pieces of a plain BibTeX entry, used by the fast path of the parser
+BIBTEX_HEADER_RE = re.compile(r'@\s*([a-zA-Z]+)\s*\{\s*([^,\s{}]+)\s*,\s*')
+BIBTEX_FIELD_RE = re.compile(r'([a-zA-Z][\w\-:.+]*)\s*=\s*')
+BIBTEX_VALUE_DELIMITER_RE = re.compile(r'[{}"]')
+BIBTEX_NUMBER_RE = re.compile(r'\d+')
+BIBTEX_SEPARATOR_RE = re.compile(r'\s*(,\s*(?:\}\s*$)?|\}\s*$)')
+
+# Content of a markdown code block such as ```bibtex ... ``` (closing fence optional)
+CODE_BLOCK_RE = re.compile(r'```[a-zA-Z]*[ \t]*\n?(.*?)(?:```|\Z)', re.DOTALL)
+
+# First number in a version selection reply, such as "2" or "Version 2"
+SELECTION_INDEX_RE = re.compile(r'\b(\d+)\b')
+
+
+def clean_latex(text: str) -> str:
+    """
+    Strip LaTeX markup from a BibTeX field value, e.g. for use in search queries.
+    
+    Args:
+        text: Field value such as '{BERT}: \\emph{Pre-training} for {\\L}ukasz \\& co.'
+        
+    Returns:
+        Plain text such as 'BERT: Pre-training for Lukasz & co.'
+    """
+    # Unwrap commands innermost first, so nested commands are fully removed
+    previous = None
+    while text != previous:
+        previous, text = text, LATEX_COMMAND_RE.sub(r'\1', text)
+    text = LATEX_MARKUP_RE.sub('', LATEX_ESCAPE_RE.sub(r'\1', text))
+    return LATEX_SPACING_RE.sub(lambda m: ' ' if m.group() == '~' else '-', text)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize case and whitespace so equivalent search queries compare equal."""
+    return ' '.join(query.lower().split())
+
+
+def first_author_surname(author: Optional[str]) -> str:
+    """
+    Get the surname of the first author of a BibTeX author field.
+    
+    Args:
+        author: Author field such as 'Vaswani, Ashish and Shazeer, Noam' or 'Ashish Vaswani'
+        
+    Returns:
+        Surname without LaTeX markup, such as 'Vaswani', or '' if there is no author
+    """
+    if not author:
+        return ''
+    # "Last, First" or "First Last"
+    author = author.split(' and ')[0].strip()
+    surname = author.split(',')[0] if ',' in author else (author.split() or [''])[-1]
+    return clean_latex(surname).strip()
+
+
+class RateLimiter:
+    """Spaces out requests to Google Scholar across worker threads."""
+    
+    def __init__(self, interval: float, jitter: float = 0.0):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            interval: Minimum number of seconds between two requests
+            jitter: Maximum random number of seconds added to each interval, so
+                concurrent workers don't hit Scholar in a regular rhythm
+        """
+        self.interval = interval
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """Block until the next request slot is available."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = (max(now, self._next_slot) + self.interval
+                               + random.uniform(0, self.jitter))
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Cache:
+    """Persistent SQLite cache of Scholar and Crossref citations and LLM responses."""
+    
+    def __init__(self, path=DEFAULT_CACHE_PATH,
+                 scholar_ttl: float = SCHOLAR_CACHE_TTL_DAYS * 24 * 60 * 60):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path: Path to the SQLite database file
+            scholar_ttl: Seconds after which cached Scholar and Crossref citations expire
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.scholar_ttl = scholar_ttl
+        # Shared by all scraper threads, so access is serialized with a lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            # Write-ahead logging lets other fixtex processes read while this one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scholar (key TEXT PRIMARY KEY, value TEXT, created REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS crossref (key TEXT PRIMARY KEY, value TEXT, created REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm (key TEXT PRIMARY KEY, value TEXT, created REAL)"
+            )
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the SHA1 of the given strings."""
+        return hashlib.sha1('\x00'.join(parts).encode('utf-8')).hexdigest()
+    
+    def get_scholar(self, query: str) -> Optional[str]:
+        """Return the cached citation for a Scholar query, if still fresh."""
+        return self._get('scholar', self._query_key(query), self.scholar_ttl)
+    
+    def put_scholar(self, query: str, bibtex: str):
+        """Store the citation found for a Scholar query."""
+        self._put('scholar', self._query_key(query), bibtex)
+    
+    def get_crossref(self, query: str) -> Optional[str]:
+        """Return the cached citation built from Crossref for a query, if still fresh."""
+        return self._get('crossref', self._query_key(query), self.scholar_ttl)
+    
+    def put_crossref(self, query: str, bibtex: str):
+        """Store the citation built from Crossref for a query."""
+        self._put('crossref', self._query_key(query), bibtex)
+    
+    def get_llm(self, key: str) -> Optional[str]:
+        """Return the cached LLM response for a key built with make_key."""
+        return self._get('llm', key)
+    
+    def put_llm(self, key: str, response: str):
+        """Store an LLM response under a key built with make_key."""
+        self._put('llm', key, response)
+    
+    def _query_key(self, query: str) -> str:
+        """Normalize case and whitespace so equivalent queries share an entry."""
+        return self.make_key(normalize_query(query))
+    
+    def _get(self, table: str, key: str, ttl: Optional[float] = None) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created FROM {table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if ttl is not None and time.time() - created > ttl:
+            return None
+        return value
+    
+    def _put(self, table: str, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+
 
 class ScholarScraper:
     """Scrapes Google Scholar for BibTeX entries."""
     
-    def __init__(self, headless: bool = True, llm_reformatter=None):
+    def __init__(self, headless: bool = True, llm_reformatter=None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[Cache] = None):
         """Initialize the scraper with Selenium WebDriver."""
         options = webdriver.ChromeOptions()
         if headless:
@@ -44,17 +348,58 @@ class ScholarScraper:
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
+        # Only the HTML is read, so skip images and stop waiting for sub-resources once the
+        # DOM is ready; stylesheets stay enabled, as the cite dialog relies on them for visibility
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+        })
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.page_load_strategy = 'eager'
         
         self.driver = webdriver.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, 10)
+        self.wait = WebDriverWait(self.driver, SCHOLAR_WAIT_TIMEOUT)
+        self.headless = headless
         self.llm_reformatter = llm_reformatter
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        
+        # Establish Scholar cookies and consent once, so searches reuse them
+        try:
+            self._throttle()
+            self.driver.get(SCHOLAR_URL)
+            # Citations are downloaded directly, looking like the browser to Scholar
+            self.session = requests.Session()
+            self.session.headers.update({
+                "User-Agent": self.driver.execute_script("return navigator.userAgent")
+            })
+        except Exception:
+            self.driver.quit()
+            raise
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Quit the browser."""
+        self.session.close()
         self.driver.quit()
     
+    def is_alive(self) -> bool:
+        """Check that the browser still responds, e.g. has not crashed."""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def _throttle(self):
+        """Wait for the shared rate limiter before loading a Scholar page."""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+    
     def search_entry(self, entry: Dict) -> Optional[str]:
         """
         Search for a BibTeX entry on Google Scholar and return the best citation.
@@ -68,41 +413,40 @@ class ScholarScraper:
         # Build search query from entry
         query = self._build_query(entry)
         if not query:
-            print(f"Warning: Could not build query for entry {entry.get('ID', 'unknown')}")
+            logger.warning(f"Could not build query for entry {entry.get('ID', 'unknown')}")
             return None
         
-        print(f"Searching for: {query}")
+        if self.cache:
+            cached = self.cache.get_scholar(query)
+            if cached:
+                logger.debug(f"Using cached citation for: {query}")
+                return cached
+        
+        logger.debug(f"Searching for: {query}")
         
         try:
             # Search on Google Scholar
-            self.driver.get(f"https://scholar.google.com/scholar?q={query}")
-            time.sleep(2)  # Wait for page load
-            
-            # Find the first result
-            results = self.driver.find_elements(By.CSS_SELECTOR, '.gs_ri')
-            if not results:
-                print(f"No results found for: {query}")
+            self._throttle()
+            # Ask for English pages, which the selectors and version links rely on
+            self.driver.get(f"{SCHOLAR_URL}/scholar?q={quote_plus(query)}&hl=en")
+            if not self._wait_for_results():
                 return None
             
-            first_result = results[0]
+            # Find the first result and its "All X versions" link in one round trip
+            first = self.driver.execute_script(FIRST_RESULT_SCRIPT)
+            first_result = first['result']
+            if not first_result:
+                logger.debug(f"No results found for: {query}")
+                return None
             
-            # Try to find and click "Cited by" or "All X versions" link
-            versions_link = None
-            try:
-                # Look for "All X versions" link
-                links = first_result.find_elements(By.CSS_SELECTOR, '.gs_fl a')
-                for link in links:
-                    if 'version' in link.text.lower():
-                        versions_link = link
-                        break
-            except NoSuchElementException:
-                pass
-            
-            # If we found versions link, click it to see all versions
-            if versions_link:
-                print(f"Found versions link: {versions_link.text}")
-                versions_link.click()
-                time.sleep(2)
+            # If we found versions link, open it to see all versions
+            versions_url = first['versions_url']
+            if versions_url:
+                logger.debug(f"Found versions link: {first['versions_text']}")
+                self._throttle()
+                self.driver.get(versions_url)
+                if not self._wait_for_results():
+                    return None
                 
                 # Now get all versions and select the most reputable one
                 best_result = self._select_best_version()
@@ -112,29 +456,67 @@ class ScholarScraper:
             
             # Get the citation for the best result
             citation = self._get_citation(best_result)
+            if citation and self.cache:
+                self.cache.put_scholar(query, citation)
             return citation
             
         except Exception as e:
-            print(f"Error searching for entry: {e}")
+            logger.warning(f"Could not search for entry: {e}")
             return None
     
-    def _build_query(self, entry: Dict) -> Optional[str]:
-        """Build a search query from a BibTeX entry."""
-        # Try to use title first
-        if 'title' in entry:
-            title = entry['title'].strip('{}')
-            return title
+    def _wait_for_results(self) -> bool:
+        """
+        Wait until a Scholar results page, or a CAPTCHA in its place, is rendered.
+        
+        Returns:
+            True once results are shown, False if a CAPTCHA blocks them
+        """
+        self.wait.until(EC.presence_of_element_located(
+            (By.CSS_SELECTOR, f"{SCHOLAR_RESULTS_SELECTOR}, {SCHOLAR_CAPTCHA_SELECTOR}")
+        ))
+        if not self.driver.find_elements(By.CSS_SELECTOR, SCHOLAR_CAPTCHA_SELECTOR):
+            return True
+        
+        if self.headless:
+            logger.warning("Google Scholar is asking for a CAPTCHA, skipping this search "
+                           "(run with --no-headless to solve it)")
+            return False
         
-        # Fallback to author + year
+        logger.warning(f"Google Scholar is asking for a CAPTCHA, please solve it in the browser "
+                       f"within {CAPTCHA_SOLVE_TIMEOUT} seconds")
+        try:
+            WebDriverWait(self.driver, CAPTCHA_SOLVE_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, SCHOLAR_RESULTS_SELECTOR))
+            )
+            return True
+        except TimeoutException:
+            logger.warning("CAPTCHA was not solved, skipping this search")
+            return False
+    
+    @staticmethod
+    def _build_query(entry: Dict) -> Optional[str]:
+        """Build a search query from the title, first author surname and year of an entry."""
+        return ScholarScraper._build_query_cached(entry.get('title'), entry.get('author'), entry.get('year'))
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _build_query_cached(title: Optional[str], author: Optional[str],
+                            year: Optional[str]) -> Optional[str]:
+        """Build a search query from entry fields; memoized for retries and duplicate entries."""
         parts = []
-        if 'author' in entry:
-            # Get first author
-            author = entry['author'].split(' and ')[0]
-            parts.append(author)
-        if 'year' in entry:
-            parts.append(entry['year'])
+        if title:
+            parts.append(clean_latex(title)[:MAX_TITLE_LENGTH])
+        
+        surname = first_author_surname(author)
+        if surname:
+            parts.append(surname)
+        
+        if year:
+            parts.append(year)
         
-        return ' '.join(parts) if parts else None
+        # Titles may span several lines in the .bib file
+        query = ' '.join(' '.join(parts).split())
+        return query[:MAX_QUERY_LENGTH] if query else None
     
     def _select_best_version(self) -> object:
         """
@@ -148,7 +530,7 @@ class ScholarScraper:
             return None
         
         if len(results) == 1:
-            print("Only one version found, using it")
+            logger.debug("Only one version found, using it")
             return results[0]
         
         # If we have an LLM reformatter, use it to select the best version
@@ -158,7 +540,7 @@ class ScholarScraper:
                 return best_result
         
         # Fallback to first result if LLM selection fails
-        print("Using first result as fallback")
+        logger.debug("Using first result as fallback")
         return results[0]
     
     def _llm_select_best_version(self, results: List) -> Optional[object]:
@@ -172,52 +554,25 @@ class ScholarScraper:
             The best result WebElement, or None if selection fails
         """
         try:
-            # Extract information about each version
-            versions_info = []
-            for i, result in enumerate(results[:10]):  # Limit to first 10 versions
-                try:
-                    # Get title
-                    title_elem = result.find_element(By.CSS_SELECTOR, '.gs_rt')
-                    title = title_elem.text
-                    
-                    # Get publication info (venue, year, etc.)
-                    info_elem = result.find_element(By.CSS_SELECTOR, '.gs_a')
-                    info = info_elem.text
-                    
-                    # Get snippet/abstract if available
-                    snippet = ""
-                    try:
-                        snippet_elem = result.find_element(By.CSS_SELECTOR, '.gs_rs')
-                        snippet = snippet_elem.text
-                    except NoSuchElementException:
-                        pass
-                    
-                    versions_info.append({
-                        'index': i,
-                        'title': title,
-                        'info': info,
-                        'snippet': snippet
-                    })
-                except Exception as e:
-                    print(f"Warning: Could not extract info for version {i}: {e}")
-                    continue
+            # Extract information about each version in one round trip to the browser
+            versions_info = self.driver.execute_script(VERSIONS_INFO_SCRIPT, MAX_VERSIONS)
             
             if not versions_info:
                 return None
             
             # Ask LLM to select the best version
-            print(f"Asking LLM to select best version from {len(versions_info)} options...")
+            logger.debug(f"Asking LLM to select best version from {len(versions_info)} options...")
             best_index = self.llm_reformatter.select_best_version(versions_info)
             
             if best_index is not None and 0 <= best_index < len(results):
-                print(f"LLM selected version {best_index}")
+                logger.debug(f"LLM selected version {best_index}")
                 return results[best_index]
             else:
-                print(f"LLM returned invalid index: {best_index}, using first result")
+                logger.warning(f"LLM returned invalid index: {best_index}, using first result")
                 return results[0]
                 
         except Exception as e:
-            print(f"Error in LLM version selection: {e}")
+            logger.warning(f"LLM version selection failed: {e}")
             return None
     
     def _get_citation(self, result) -> Optional[str]:
@@ -234,211 +589,1038 @@ class ScholarScraper:
             # Find the cite button
             cite_button = result.find_element(By.CSS_SELECTOR, '.gs_or_cit')
             cite_button.click()
-            time.sleep(1)
             
-            # Click on BibTeX link
+            # Wait for the cite dialog to render the BibTeX link
             bibtex_link = self.wait.until(
-                EC.presence_of_element_located((By.LINK_TEXT, 'BibTeX'))
+                EC.element_to_be_clickable((By.LINK_TEXT, 'BibTeX'))
             )
+            
+            # Download the citation with the browser's cookies instead of opening it
+            bibtex_url = bibtex_link.get_attribute('href')
+            bibtex_content = self._download_citation(bibtex_url) if bibtex_url else None
+            if bibtex_content:
+                return bibtex_content
+            
             bibtex_link.click()
-            time.sleep(1)
             
             # Get the BibTeX content
-            bibtex_content = self.driver.find_element(By.TAG_NAME, 'pre').text
-            
-            # Go back to search results
-            self.driver.back()
-            time.sleep(1)
+            bibtex_content = self.wait.until(
+                EC.presence_of_element_located((By.TAG_NAME, 'pre'))
+            ).text
             
+            # No need to go back: the next search navigates to a new results page
             return bibtex_content
             
         except Exception as e:
-            print(f"Error getting citation: {e}")
+            logger.warning(f"Could not get citation: {e}")
             return None
-
-
-class LLMReformatter:
-    """Uses OpenRouter API to reformat BibTeX entries."""
     
-    def __init__(self, api_key: str, model: str = "anthropic/claude-3.5-sonnet"):
+    def _download_citation(self, url: str) -> Optional[str]:
         """
-        Initialize the LLM reformatter.
+        Fetch a citation from Scholar's BibTeX link over HTTP.
         
-        Args:
-            api_key: OpenRouter API key
-            model: Model to use for reformatting
+        Returns:
+            BibTeX string, or None if the download fails (e.g. Scholar asks for a CAPTCHA)
         """
-        self.api_key = api_key
-        self.model = model
-        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        cookies = {c['name']: c['value'] for c in self.driver.get_cookies()}
+        try:
+            response = self.session.get(url, cookies=cookies, timeout=SCHOLAR_WAIT_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.debug(f"Could not download citation, opening it in the browser: {e}")
+            return None
+        
+        # Scholar serves UTF-8 without always saying so, which requests would decode as Latin-1
+        bibtex_content = response.content.decode('utf-8', errors='replace').strip()
+        return bibtex_content if bibtex_content.startswith('@') else None
+
+
+class ScholarScraperPool:
+    """A pool of ScholarScraper instances, one browser per concurrent search."""
     
-    def reformat(self, bibtex: str, style: str = "standard") -> Optional[str]:
+    def __init__(self, size: int, **scraper_kwargs):
         """
-        Reformat a BibTeX entry using an LLM.
+        Initialize the pool. Browsers are started on demand, up to size of them.
         
         Args:
-            bibtex: BibTeX entry to reformat
-            style: Citation style to use
-            
-        Returns:
-            Reformatted BibTeX string or None on error
+            size: Maximum number of browsers
+            **scraper_kwargs: Arguments passed to each ScholarScraper
         """
-        prompt = self._build_prompt(bibtex, style)
-        
+        self.size = max(1, size)
+        self.scraper_kwargs = scraper_kwargs
+        self._idle = []
+        self._started = 0
+        self._lock = threading.Lock()
+        # Notified when a scraper becomes idle or a slot for a new browser frees up
+        self._available = threading.Condition(self._lock)
+        self._scrapers = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Quit all browsers."""
+        with self._lock:
+            scrapers, self._scrapers = self._scrapers, []
+        for scraper in scrapers:
+            self._close_scraper(scraper)
+    
+    def check_health(self):
+        """Quit idle browsers that stopped responding; replacements are started on demand."""
+        with self._lock:
+            scrapers, self._idle = self._idle, []
+        for scraper in scrapers:
+            alive = scraper.is_alive()
+            with self._available:
+                if alive:
+                    self._idle.append(scraper)
+                else:
+                    self._scrapers.remove(scraper)
+                    self._started -= 1
+                # Wake a search waiting for this scraper, or to start its replacement
+                self._available.notify()
+            if not alive:
+                logger.warning("A browser stopped responding, replacing it")
+                self._close_scraper(scraper)
+    
+    @staticmethod
+    def _close_scraper(scraper: ScholarScraper):
         try:
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                },
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            # Extract the reformatted BibTeX from the response
-            content = result['choices'][0]['message']['content']
-            
-            # Extract BibTeX from markdown code blocks if present
-            if '```' in content:
-                # Find content between ```bibtex or ``` and ```
-                lines = content.split('\n')
-                in_code_block = False
-                bibtex_lines = []
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        if in_code_block:
-                            break
-                        in_code_block = True
-                        continue
-                    if in_code_block:
-                        bibtex_lines.append(line)
-                content = '\n'.join(bibtex_lines)
-            
-            return content.strip()
-            
+            scraper.close()
         except Exception as e:
-            print(f"Error reformatting with LLM: {e}")
-            return None
+            logger.warning(f"Could not close browser: {e}")
     
-    def _build_prompt(self, bibtex: str, style: str) -> str:
-        """Build the prompt for the LLM."""
-        return f"""Please reformat the following BibTeX entry according to {style} style.
-Ensure the entry is properly formatted, has consistent capitalization, and includes all necessary fields.
-Remove any duplicate or redundant information.
-Return only the reformatted BibTeX entry, without any additional explanation.
+    @contextmanager
+    def acquire(self) -> Iterator[ScholarScraper]:
+        """Borrow a scraper for the duration of a with block."""
+        # Selenium drivers are not thread-safe, so each scraper has one user at a time
+        with self._available:
+            while not self._idle and self._started >= self.size:
+                self._available.wait()
+            scraper = self._idle.pop() if self._idle else None
+            if scraper is None:
+                self._started += 1
+        if scraper is None:
+            try:
+                scraper = ScholarScraper(**self.scraper_kwargs)
+            except Exception:
+                with self._available:
+                    self._started -= 1
+                    self._available.notify()
+                raise
+            with self._lock:
+                self._scrapers.append(scraper)
+        try:
+            yield scraper
+        finally:
+            with self._available:
+                self._idle.append(scraper)
+                self._available.notify()
+    
+    def search_entry(self, entry: Dict) -> Optional[str]:
+        """Search for an entry with whichever scraper is available."""
+        with self.acquire() as scraper:
+            return scraper.search_entry(entry)
 
-BibTeX entry:
-{bibtex}
 
-Reformatted BibTeX entry:"""
+class CrossrefClient:
+    """Looks up entries in the Crossref REST API, which is much faster than scraping Scholar."""
     
-    def select_best_version(self, versions: List[Dict]) -> Optional[int]:
+    def __init__(self, cache: Optional[Cache] = None, mailto: Optional[str] = None,
+                 max_connections: int = 10):
         """
-        Use LLM to select the most reputable version from a list of versions.
+        Initialize the Crossref client.
         
         Args:
-            versions: List of version dictionaries with 'index', 'title', 'info', 'snippet'
+            cache: Optional cache of previous lookups
+            mailto: Contact email sent to Crossref, which routes requests to its faster "polite" pool
+            max_connections: Number of connections kept open for concurrent requests
+        """
+        self.cache = cache
+        
+        self.session = requests.Session()
+        retry = Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+        self.session.mount("https://", HTTPAdapter(
+            pool_maxsize=max_connections,
+            pool_block=True,
+            max_retries=retry
+        ))
+        user_agent = "fixtex"
+        if mailto:
+            user_agent += f" (mailto:{mailto})"
+        self.session.headers.update({"User-Agent": user_agent})
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Close the connections to Crossref."""
+        self.session.close()
+    
+    def search_entry(self, entry: Dict) -> Optional[str]:
+        """
+        Search for a BibTeX entry on Crossref.
+        
+        Args:
+            entry: BibTeX entry dictionary
             
         Returns:
-            Index of the best version, or None on error
+            BibTeX string built from the matching Crossref work, or None if there is
+            no unambiguous match
         """
-        prompt = self._build_selection_prompt(versions)
+        query = ScholarScraper._build_query(entry)
+        if not query or not entry.get('title'):
+            return None
+        
+        if self.cache:
+            cached = self.cache.get_crossref(query)
+            if cached:
+                logger.debug(f"Using cached Crossref citation for: {query}")
+                return cached
         
         try:
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                },
-                timeout=30
+            response = self.session.get(
+                CROSSREF_URL,
+                params={"query.bibliographic": query, "rows": CROSSREF_ROWS},
+                timeout=CROSSREF_TIMEOUT
             )
-            
             response.raise_for_status()
-            result = response.json()
-            
-            # Extract the selected index from the response
-            content = result['choices'][0]['message']['content'].strip()
-            
-            # Try to extract the number from the response
-            # Look for patterns like "Version 0", "0", "index 0", etc.
-            numbers = re.findall(r'\b(\d+)\b', content)
-            if numbers:
-                selected_index = int(numbers[0])
-                return selected_index
-            
+            items = response.json()['message']['items']
+        except Exception as e:
+            logger.warning(f"Could not search Crossref: {e}")
+            return None
+        
+        item = self._select_match(entry, items)
+        if item is None:
+            logger.debug(f"No unambiguous Crossref match for: {query}")
             return None
+        
+        logger.debug(f"Found on Crossref: {query}")
+        citation = self._to_bibtex(item, entry.get('ID', 'unknown'))
+        if self.cache:
+            self.cache.put_crossref(query, citation)
+        return citation
+    
+    @staticmethod
+    def _select_match(entry: Dict, items: List[Dict]) -> Optional[Dict]:
+        """
+        Pick the work with the entry's title, first author and year, and the most reputable type.
+        
+        Returns None if no work matches, or if several works of the best type
+        appear in different venues; Scholar's version selection handles those.
+        """
+        wanted = CrossrefClient._normalize_title(clean_latex(entry.get('title', '')))
+        surname = CrossrefClient._normalize_name(first_author_surname(entry.get('author')))
+        year_match = re.search(r'\d{4}', entry.get('year', ''))
+        year = int(year_match.group()) if year_match else None
+        ranks = {work_type: rank for rank, work_type in enumerate(CROSSREF_ENTRY_TYPES)}
+        
+        matches = []
+        for item in items:
+            if item.get('type') not in ranks or not item.get('title'):
+                continue
+            found = CrossrefClient._normalize_title(item['title'][0])
+            if difflib.SequenceMatcher(None, wanted, found).ratio() < CROSSREF_MIN_TITLE_SIMILARITY:
+                continue
             
-        except Exception as e:
-            print(f"Error selecting best version with LLM: {e}")
+            # Different papers often share a title, e.g. "Deep learning"
+            if surname:
+                found_surname = CrossrefClient._normalize_name(CrossrefClient._first_author(item))
+                # Particles may be missing on either side, e.g. "Berg" and "van den Berg"
+                if not found_surname or not (surname.endswith(found_surname)
+                                             or found_surname.endswith(surname)):
+                    continue
+            found_year = CrossrefClient._year(item)
+            if year and found_year and abs(year - found_year) > 1:
+                continue
+            matches.append(item)
+        if not matches:
+            return None
+        
+        best_rank = min(ranks[item['type']] for item in matches)
+        best = [item for item in matches if ranks[item['type']] == best_rank]
+        venues = {CrossrefClient._normalize_title(' '.join(item.get('container-title', [])))
+                  for item in best}
+        if len(venues) > 1:
             return None
+        return best[0]
     
-    def _build_selection_prompt(self, versions: List[Dict]) -> str:
-        """Build the prompt for version selection."""
-        versions_text = []
-        for v in versions:
-            versions_text.append(f"""Version {v['index']}:
-Title: {v['title']}
-Publication Info: {v['info']}
-Snippet: {v['snippet'][:200] if v['snippet'] else 'N/A'}
-""")
+    @staticmethod
+    def _first_author(item: Dict) -> str:
+        """Family name of the first author of a Crossref work, or '' if it has no authors."""
+        authors = item.get('author') or []
+        first = next((a for a in authors if a.get('sequence') == 'first'), authors[0] if authors else {})
+        if first.get('family'):
+            return first['family']
+        # Organizations only have a name; use its last word, like first_author_surname does
+        return (first.get('name', '').split() or [''])[-1]
+    
+    @staticmethod
+    def _year(item: Dict) -> Optional[int]:
+        """Publication year of a Crossref work, if known."""
+        date_parts = (item.get('issued') or {}).get('date-parts') or [[]]
+        return date_parts[0][0] if date_parts[0] and date_parts[0][0] else None
+    
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Lowercase a name and reduce it to letters without accents."""
+        name = unicodedata.normalize('NFKD', name)
+        name = ''.join(c for c in name if not unicodedata.combining(c))
+        return re.sub(r'\W+', '', name.lower())
+    
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        """Lowercase a title and reduce it to words, ignoring markup and punctuation."""
+        title = html.unescape(CROSSREF_MARKUP_RE.sub('', title))
+        return ' '.join(re.sub(r'\W+', ' ', title.lower()).split())
+    
+    @staticmethod
+    def _to_bibtex(item: Dict, entry_id: str) -> str:
+        """Build a BibTeX entry from the fields of a Crossref work."""
+        entry_type = CROSSREF_ENTRY_TYPES[item['type']]
         
-        versions_str = "\n---\n".join(versions_text)
+        def text(value: str) -> str:
+            value = html.unescape(CROSSREF_MARKUP_RE.sub('', value))
+            return ' '.join(LATEX_SPECIAL_RE.sub(r'\\\1', value).split())
+        
+        fields = [('title', text(item['title'][0]))]
+        
+        authors = []
+        for author in item.get('author', []):
+            if author.get('family'):
+                name = author['family']
+                if author.get('given'):
+                    name += f", {author['given']}"
+                authors.append(text(name))
+            elif author.get('name'):
+                authors.append(f"{{{text(author['name'])}}}")
+        if authors:
+            fields.append(('author', ' and '.join(authors)))
+        
+        if item.get('container-title'):
+            venue_field = 'journal' if entry_type == 'article' else 'booktitle'
+            fields.append((venue_field, text(item['container-title'][0])))
         
-        return f"""You are helping to select the most reputable publication version from multiple sources.
+        for field, key in (('volume', 'volume'), ('number', 'issue')):
+            if item.get(key):
+                fields.append((field, text(item[key])))
+        if item.get('page'):
+            fields.append(('pages', text(item['page']).replace('-', '--')))
+        
+        year = CrossrefClient._year(item)
+        if year:
+            fields.append(('year', str(year)))
+        
+        if item.get('publisher') and entry_type != 'article':
+            fields.append(('publisher', text(item['publisher'])))
+        if item.get('DOI'):
+            fields.append(('doi', item['DOI']))
+        
+        lines = [f"@{entry_type}{{{entry_id},"]
+        lines += [f"  {field} = {{{value}}}," for field, value in fields]
+        lines.append("}")
+        return '\n'.join(lines)
+
+
+class LLMReformatter:
+    """Uses OpenRouter API to reformat BibTeX entries."""
+    
+    # Instructions are sent as an identical system message on every request,
+    # so the provider can serve them from its prompt cache
+    REFORMAT_INSTRUCTIONS = """You reformat BibTeX entries according to a given citation style.
+Ensure the entry is properly formatted, has consistent capitalization, and includes all necessary fields.
+Remove any duplicate or redundant information.
+Return only the reformatted BibTeX entry, without any additional explanation."""
+    
+    BATCH_REFORMAT_INSTRUCTIONS = """You reformat BibTeX entries according to a given citation style.
+Ensure each entry is properly formatted, has consistent capitalization, and includes all necessary fields.
+Remove any duplicate or redundant information.
+You will be given several numbered entries. Respond with only a JSON object of the form
+{"entries": [{"index": <entry number>, "bibtex": "<reformatted BibTeX entry>"}, ...]}
+containing one item per entry, without any additional explanation."""
+    
+    SELECTION_INSTRUCTIONS = """You are helping to select the most reputable publication version from multiple sources.
 Consider the following factors in order of importance:
 1. Peer-reviewed conference/journal publications are most reputable (e.g., ICML, NeurIPS, CVPR, ACL, IEEE, ACM)
 2. Workshop papers and published proceedings are moderately reputable
 3. Preprint servers (arXiv, bioRxiv) are less reputable than peer-reviewed venues
 4. PDFs from personal websites or unknown sources are least reputable
 
-Below are the available versions of a paper. Please select the MOST REPUTABLE version.
-
-{versions_str}
-
 Please respond with ONLY the number (index) of the most reputable version. For example, if Version 2 is most reputable, respond with just "2"."""
-
-
-def parse_bibtex_file(filepath: str) -> List[Dict]:
-    """
-    Parse a BibTeX file and return a list of entries.
     
-    Args:
-        filepath: Path to the .bib file
+    def __init__(self, api_key: str, model: str = "anthropic/claude-3.5-sonnet",
+                 cache: Optional[Cache] = None, max_connections: int = 10,
+                 batch_size: int = LLM_BATCH_SIZE):
+        """
+        Initialize the LLM reformatter.
         
-    Returns:
-        List of BibTeX entry dictionaries
-    """
-    with open(filepath, 'r', encoding='utf-8') as bibfile:
-        parser = BibTexParser()
-        parser.ignore_nonstandard_types = False
-        bib_database = bibtexparser.load(bibfile, parser=parser)
-        return bib_database.entries
-
-
-def write_bibtex_file(filepath: str, entries: List[Dict]):
-    """
+        Args:
+            api_key: OpenRouter API key
+            model: Model to use for reformatting
+            cache: Optional cache of previous reformatting results
+            max_connections: Number of connections kept open for concurrent requests
+            batch_size: Maximum number of entries reformatted per request
+        """
+        self.api_key = api_key
+        self.model = model
+        self.base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        
+        # Keep connections to OpenRouter alive between requests and retry
+        # rate-limited or failed requests with exponential backoff; a 429's
+        # Retry-After header takes precedence over the backoff
+        self.session = requests.Session()
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"]
+        )
+        self.session.mount("https://", HTTPAdapter(
+            pool_maxsize=max_connections,
+            pool_block=True,
+            max_retries=retry
+        ))
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Close the connections to OpenRouter."""
+        self.session.close()
+    
+    def reformat(self, bibtex: str, style: str = "standard") -> Optional[str]:
+        """
+        Reformat a BibTeX entry using an LLM.
+        
+        Args:
+            bibtex: BibTeX entry to reformat
+            style: Citation style to use
+            
+        Returns:
+            Reformatted BibTeX string or None on error
+        """
+        return self.reformat_batch([bibtex], style)[0]
+    
+    def reformat_batch(self, bibtexs: List[str], style: str = "standard") -> List[Optional[str]]:
+        """
+        Reformat several BibTeX entries, batch_size of them per LLM request.
+        
+        Entries missing from a batch response are reformatted one by one.
+        
+        Args:
+            bibtexs: BibTeX entries to reformat
+            style: Citation style to use
+            
+        Returns:
+            Reformatted BibTeX strings (None on error), in the same order as bibtexs
+        """
+        results: List[Optional[str]] = [None] * len(bibtexs)
+        
+        # Only send distinct entries that have not been reformatted before
+        pending = []
+        duplicates = {}
+        for i, bibtex in enumerate(bibtexs):
+            if self.cache:
+                results[i] = self.cache.get_llm(Cache.make_key(self.model, style, bibtex))
+            if results[i] is None:
+                duplicates.setdefault(bibtex, []).append(i)
+                if len(duplicates[bibtex]) == 1:
+                    pending.append(i)
+        
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            reformatted = {}
+            if len(chunk) > 1:
+                reformatted = self._reformat_chunk([bibtexs[i] for i in chunk], style)
+                if len(reformatted) < len(chunk):
+                    logger.warning(f"LLM returned {len(reformatted)} of {len(chunk)} entries, "
+                                   f"reformatting the rest one by one")
+            
+            for position, i in enumerate(chunk):
+                result = reformatted.get(position)
+                if result is None:
+                    result = self._reformat_single(bibtexs[i], style)
+                results[i] = result
+                # Only cache replies that parse, so unusable ones are retried next run
+                if result and self.cache and _parse_reformatted(result) is not None:
+                    self.cache.put_llm(Cache.make_key(self.model, style, bibtexs[i]), result)
+        
+        # Fan results out to repeated entries
+        for indices in duplicates.values():
+            for i in indices[1:]:
+                results[i] = results[indices[0]]
+        
+        return results
+    
+    def _reformat_single(self, bibtex: str, style: str) -> Optional[str]:
+        """Reformat one entry, with the LLM replying in plain BibTeX."""
+        prompt = self._build_prompt(bibtex, style)
+        
+        try:
+            return self._extract_code_block(
+                self._complete(self.REFORMAT_INSTRUCTIONS, prompt)
+            ).strip()
+            
+        except Exception as e:
+            logger.warning(f"Could not reformat with LLM: {e}")
+            return None
+    
+    def _reformat_chunk(self, bibtexs: List[str], style: str) -> Dict[int, str]:
+        """
+        Reformat several entries with one request, the LLM replying in JSON.
+        
+        Returns:
+            Dictionary mapping positions in bibtexs to reformatted entries; entries
+            the response does not contain (or the whole batch, on error) are left out
+        """
+        prompt = self._build_batch_prompt(bibtexs, style)
+        
+        try:
+            content = self._extract_code_block(
+                self._complete(self.BATCH_REFORMAT_INSTRUCTIONS, prompt, json_response=True)
+            )
+            # LLMs often put raw newlines inside JSON strings, which strict mode rejects
+            items = json.loads(content, strict=False)['entries']
+            
+            reformatted = {}
+            for item in items:
+                index, bibtex = item.get('index'), item.get('bibtex')
+                if isinstance(index, int) and 0 <= index < len(bibtexs) and isinstance(bibtex, str):
+                    reformatted[index] = bibtex.strip()
+            return reformatted
+            
+        except Exception as e:
+            logger.warning(f"Could not reformat batch with LLM: {e}")
+            return {}
+    
+    def _complete(self, instructions: str, prompt: str, json_response: bool = False) -> str:
+        """Send a chat completion request and return the reply text."""
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": instructions,
+                            "cache_control": {"type": "ephemeral"}
+                        }
+                    ]
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+        }
+        if json_response:
+            payload["response_format"] = {"type": "json_object"}
+        
+        response = self.session.post(
+            self.base_url,
+            json=payload,
+            timeout=LLM_TIMEOUT
+        )
+        
+        response.raise_for_status()
+        result = response.json()
+        return result['choices'][0]['message']['content']
+    
+    @staticmethod
+    def _extract_code_block(content: str) -> str:
+        """Extract BibTeX from the first markdown code block if present."""
+        match = CODE_BLOCK_RE.search(content)
+        return match.group(1) if match else content
+    
+    def _build_prompt(self, bibtex: str, style: str) -> str:
+        """Build the per-entry part of the prompt for the LLM."""
+        return f"""Citation style: {style}
+
+BibTeX entry:
+{bibtex}
+
+Reformatted BibTeX entry:"""
+    
+    def _build_batch_prompt(self, bibtexs: List[str], style: str) -> str:
+        """Build the per-request part of the prompt for reformatting several entries at once."""
+        entries_str = "\n\n".join(
+            f"Entry {i}:\n{bibtex}" for i, bibtex in enumerate(bibtexs)
+        )
+        
+        return f"""Citation style: {style}
+
+BibTeX entries ({len(bibtexs)}):
+
+{entries_str}"""
+    
+    def select_best_version(self, versions: List[Dict]) -> Optional[int]:
+        """
+        Use LLM to select the most reputable version from a list of versions.
+        
+        Args:
+            versions: List of version dictionaries with 'index', 'title', 'info', 'snippet'
+            
+        Returns:
+            Index of the best version, or None on error
+        """
+        prompt = self._build_selection_prompt(versions)
+        
+        try:
+            # Ask the LLM, unless this choice was already made in an earlier run
+            cache_key = None
+            content = None
+            if self.cache:
+                cache_key = Cache.make_key(self.model, self.SELECTION_INSTRUCTIONS, prompt)
+                content = self.cache.get_llm(cache_key)
+            cached = content is not None
+            if not cached:
+                content = self._complete(self.SELECTION_INSTRUCTIONS, prompt).strip()
+            
+            # Extract the selected index from the response, caching only replies that have one
+            match = SELECTION_INDEX_RE.search(content)
+            if not match:
+                return None
+            if cache_key and not cached:
+                self.cache.put_llm(cache_key, content)
+            return int(match.group(1))
+            
+        except Exception as e:
+            logger.warning(f"Could not select best version with LLM: {e}")
+            return None
+    
+    def _build_selection_prompt(self, versions: List[Dict]) -> str:
+        """Build the prompt for version selection."""
+        versions_text = []
+        for v in versions:
+            versions_text.append(f"""Version {v['index']}:
+Title: {v['title']}
+Publication Info: {v['info']}
+Snippet: {v['snippet'][:200] if v['snippet'] else 'N/A'}
+""")
+        
+        versions_str = "\n---\n".join(versions_text)
+        
+        return f"""Below are the available versions of a paper. Please select the MOST REPUTABLE version.
+
+{versions_str}"""
+
+
+class ScraperDaemonClient:
+    """Sends Scholar searches to a running fixtex daemon, over one connection per thread."""
+    
+    def __init__(self, socket_path=DAEMON_SOCKET_PATH):
+        """
+        Connect to the daemon.
+        
+        Args:
+            socket_path: Path to the daemon's socket
+            
+        Raises:
+            OSError: If no daemon is listening on the socket
+        """
+        self.address = str(socket_path)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        # Fail now rather than on the first search if the daemon is gone
+        self._connection()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def close(self):
+        """Close all connections to the daemon."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+    
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = Client(self.address, family='AF_UNIX')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+    
+    def settings(self) -> Optional[Dict]:
+        """
+        Get the browser and cache options the daemon runs with, as made by _daemon_settings.
+        
+        Raises:
+            OSError, EOFError: If the connection to the daemon is lost
+        """
+        return self._request({"settings": True}).get('settings')
+    
+    def search_entry(self, entry: Dict) -> Optional[str]:
+        """
+        Search for an entry with one of the daemon's browsers.
+        
+        Raises:
+            OSError, EOFError: If the connection to the daemon is lost
+            RuntimeError: If the daemon could not search, e.g. its browser failed to start
+        """
+        response = self._request({"entry": entry})
+        if response.get('error'):
+            raise RuntimeError(response['error'])
+        return response['citation']
+    
+    def _request(self, request: Dict) -> Dict:
+        try:
+            connection = self._connection()
+            connection.send_bytes(json.dumps(request).encode('utf-8'))
+            return json.loads(connection.recv_bytes())
+        except (OSError, EOFError):
+            # Reconnect on the next request, in case the daemon was restarted
+            self._local.connection = None
+            raise
+
+
+def _daemon_settings(headless: bool, use_cache: bool, cache_path,
+                     cache_ttl_days: float) -> Dict:
+    """Options that change Scholar search results, which a daemon and its clients must share."""
+    return {
+        "headless": headless,
+        "cache_path": str(Path(cache_path).expanduser().resolve()) if use_cache else None,
+        "cache_ttl_days": cache_ttl_days if use_cache else None,
+    }
+
+
+def _serve_client(connection, pool: ScholarScraperPool, settings: Dict):
+    """Answer the requests sent over one client connection until it is closed."""
+    with connection:
+        while True:
+            try:
+                request = json.loads(connection.recv_bytes())
+            except (OSError, EOFError):
+                return
+            
+            if request.get('settings'):
+                response = {"settings": settings}
+            else:
+                try:
+                    response = {"citation": pool.search_entry(request['entry'])}
+                except Exception as e:
+                    response = {"citation": None, "error": str(e)}
+            try:
+                connection.send_bytes(json.dumps(response).encode('utf-8'))
+            except OSError:
+                return
+
+
+def serve_scrapers(socket_path=DAEMON_SOCKET_PATH, api_key: Optional[str] = None,
+                   headless: bool = True, use_cache: bool = True,
+                   cache_path=DEFAULT_CACHE_PATH,
+                   cache_ttl_days: float = SCHOLAR_CACHE_TTL_DAYS):
+    """
+    Run a daemon that keeps browsers running and searches Scholar for fixtex runs.
+    
+    Runs until interrupted. While it runs, process_bibtex sends its Scholar
+    searches here instead of starting its own browsers.
+    
+    Args:
+        socket_path: Path of the socket to listen on
+        api_key: OpenRouter API key for version selection (if None, reads from environment)
+        headless: Whether to run browsers in headless mode
+        use_cache: Whether to reuse citations and LLM responses from previous runs
+        cache_path: Path to the SQLite cache database
+        cache_ttl_days: Days after which cached citations are searched again
+    """
+    pool_size = os.getenv('SCRAPER_POOLING_MIN_SIZE', str(SCRAPER_POOLING_MIN_SIZE))
+    try:
+        pool_size = int(pool_size)
+    except ValueError:
+        logger.error(f"SCRAPER_POOLING_MIN_SIZE must be a number of browsers, not {pool_size!r}")
+        sys.exit(1)
+    
+    socket_path = Path(socket_path)
+    # Only the current user may connect: requests are answered without authentication
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if socket_path.exists():
+        try:
+            Client(str(socket_path), family='AF_UNIX').close()
+            logger.error(f"A fixtex daemon is already running on {socket_path}")
+            sys.exit(1)
+        except OSError:
+            # Left behind by a daemon that did not shut down cleanly
+            socket_path.unlink()
+    
+    if api_key is None:
+        api_key = os.getenv('OPENROUTER_API_KEY')
+    
+    with ExitStack() as stack:
+        cache = None
+        if use_cache:
+            cache = stack.enter_context(Cache(cache_path, scholar_ttl=cache_ttl_days * 24 * 60 * 60))
+        reformatter = None
+        if api_key:
+            reformatter = stack.enter_context(LLMReformatter(
+                api_key,
+                cache=cache,
+                max_connections=pool_size
+            ))
+        else:
+            logger.warning("OPENROUTER_API_KEY not set, using the first version of each paper")
+        
+        pool = stack.enter_context(ScholarScraperPool(
+            pool_size,
+            headless=headless,
+            llm_reformatter=reformatter,
+            rate_limiter=RateLimiter(SCHOLAR_REQUEST_INTERVAL, SCHOLAR_REQUEST_JITTER),
+            cache=cache
+        ))
+        
+        # Start all browsers now, so that clients never wait for one to start
+        logger.info(f"Starting {pool.size} browsers...")
+        with ExitStack() as warm_up:
+            for _ in range(pool.size):
+                warm_up.enter_context(pool.acquire())
+        
+        stopped = threading.Event()
+        stack.callback(stopped.set)
+        
+        def check_health():
+            while not stopped.wait(DAEMON_HEALTH_CHECK_INTERVAL):
+                pool.check_health()
+        
+        threading.Thread(target=check_health, daemon=True).start()
+        
+        settings = _daemon_settings(headless, use_cache, cache_path, cache_ttl_days)
+        listener = stack.enter_context(Listener(str(socket_path), family='AF_UNIX'))
+        logger.info(f"fixtex daemon listening on {socket_path} (stop with Ctrl+C)")
+        try:
+            while True:
+                connection = listener.accept()
+                threading.Thread(
+                    target=_serve_client, args=(connection, pool, settings), daemon=True
+                ).start()
+        except KeyboardInterrupt:
+            logger.info("Stopping fixtex daemon")
+
+
+def _iter_bibtex_blocks(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Split BibTeX text into top-level @type{...} blocks by tracking brace depth.
+    
+    Text outside of blocks (implicit comments) is skipped. Blocks delimited
+    with parentheses, e.g. @string(...), are supported as well.
+    
+    Args:
+        lines: Lines of BibTeX text
+        
+    Yields:
+        The source text of each block
+    """
+    pieces = []
+    in_block = False
+    closer = None  # '}' or ')' once the opening delimiter has been read
+    depth = 0
+    
+    for line in lines:
+        start = 0
+        # Only delimiters can change the state, so jump straight between them
+        for match in BIBTEX_DELIMITER_RE.finditer(line):
+            char, pos = match.group(), match.start()
+            if not in_block:
+                if char == '@':
+                    in_block, closer, depth, start = True, None, 0, pos
+                continue
+            
+            if closer is None:
+                if char == '{':
+                    closer, depth = '}', 1
+                elif char == '(':
+                    closer = ')'
+                elif char == '@':
+                    # A stray '@' in a comment: the block really starts here
+                    pieces, start = [], pos
+                continue
+            
+            if char == '{':
+                depth += 1
+                continue
+            if char == '}':
+                depth -= 1
+                done = closer == '}' and depth == 0
+            else:
+                done = char == ')' and closer == ')' and depth == 0
+            
+            if done:
+                pieces.append(line[start:pos + 1])
+                yield ''.join(pieces)
+                pieces = []
+                in_block = False
+        
+        if in_block:
+            pieces.append(line[start:])
+    
+    # Let the parser report an unterminated trailing block
+    if in_block:
+        yield ''.join(pieces)
+
+
+def _parse_simple_entry(block: str) -> Optional[Dict]:
+    """
+    Parse a plain @type{ID, field = {...}, ...} block without bibtexparser.
+    
+    Only handles braced, quoted and numeric field values. Anything else (string
+    macros, # concatenation, @string/@comment blocks, duplicate fields) returns
+    None so the caller can fall back to the full parser.
+    
+    Args:
+        block: Source text of one top-level BibTeX block
+        
+    Returns:
+        Entry dictionary in bibtexparser's format, or None
+    """
+    header = BIBTEX_HEADER_RE.match(block)
+    if not header or header.group(1).lower() in ('string', 'preamble', 'comment'):
+        return None
+    
+    entry = {}
+    pos = header.end()
+    while True:
+        field = BIBTEX_FIELD_RE.match(block, pos)
+        if not field:
+            break
+        name = field.group(1).lower()
+        pos = field.end()
+        opener = block[pos:pos + 1]
+        
+        if opener in ('{', '"'):
+            # Find the matching closing delimiter at brace depth zero
+            depth = 0
+            end = None
+            for match in BIBTEX_VALUE_DELIMITER_RE.finditer(block, pos + 1):
+                char = match.group()
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    if depth == 0:
+                        if opener == '{':
+                            end = match.start()
+                        break
+                    depth -= 1
+                elif opener == '"' and depth == 0:
+                    end = match.start()
+                    break
+            if end is None:
+                return None
+            value = block[pos + 1:end]
+            pos = end + 1
+        else:
+            number = BIBTEX_NUMBER_RE.match(block, pos)
+            if not number:
+                return None
+            value = number.group()
+            pos = number.end()
+        
+        if name in entry:
+            return None
+        # Normalize the value the same way bibtexparser does
+        if value == '{}':
+            value = ''
+        elif '\n' in value or '\r' in value:
+            lines = value.splitlines()
+            value = '\n'.join([lines[0]] + [line.lstrip() for line in lines[1:]])
+        entry[name] = value
+        
+        separator = BIBTEX_SEPARATOR_RE.match(block, pos)
+        if not separator:
+            return None
+        pos = separator.end()
+        if separator.group(1) == '}':
+            break
+    
+    # The whole block must have been consumed
+    if block[pos:].strip():
+        return None
+    
+    entry['ENTRYTYPE'] = header.group(1).lower()
+    entry['ID'] = header.group(2)
+    return entry
+
+
+def iter_bibtex_entries(filepath: str) -> Iterator[Dict]:
+    """
+    Lazily parse a BibTeX file, yielding entries as soon as they are read.
+    
+    @string definitions are remembered, so later entries can use them.
+    
+    Args:
+        filepath: Path to the .bib file
+        
+    Yields:
+        BibTeX entry dictionaries
+    """
+    parser = _make_parser()
+    
+    with open(filepath, 'r', encoding='utf-8') as bibfile:
+        for block in _iter_bibtex_blocks(bibfile):
+            entry = _parse_simple_entry(block)
+            if entry is not None:
+                yield entry
+                continue
+            
+            yield from _parse_with(parser, block)
+
+
+def _make_parser() -> BibTexParser:
+    """Create a BibTexParser that keeps all entry types and can be reused across blocks."""
+    parser = BibTexParser()
+    parser.ignore_nonstandard_types = False
+    parser.expect_multiple_parse = True
+    return parser
+
+
+def _parse_with(parser: BibTexParser, bibtex: str) -> List[Dict]:
+    """Parse a string with a reused parser and return only the entries it contained."""
+    # The parser accumulates into one database; hand off and drop new entries
+    entries = parser.parse(bibtex).entries
+    parsed = list(entries)
+    entries.clear()
+    return parsed
+
+
+def parse_bibtex_file(filepath: str) -> List[Dict]:
+    """
+    Parse a BibTeX file and return a list of entries.
+    
+    Args:
+        filepath: Path to the .bib file
+        
+    Returns:
+        List of BibTeX entry dictionaries
+    """
+    return list(iter_bibtex_entries(filepath))
+
+
+def write_bibtex_file(filepath: str, entries: List[Dict]):
+    """
     Write BibTeX entries to a file.
     
     Args:
@@ -448,16 +1630,263 @@ def write_bibtex_file(filepath: str, entries: List[Dict]):
     db = bibtexparser.bibdatabase.BibDatabase()
     db.entries = entries
     
+    with open(filepath, 'w', encoding='utf-8') as bibfile:
+        bibfile.write(_make_writer().write(db))
+
+
+def _make_writer() -> BibTexWriter:
+    """Create a BibTexWriter that keeps entries in their original order."""
     writer = BibTexWriter()
     writer.indent = '  '
     writer.order_entries_by = None
+    return writer
+
+
+class BibTeXStreamWriter:
+    """
+    Writes BibTeX entries to a file one at a time, so progress survives a crash.
     
-    with open(filepath, 'w', encoding='utf-8') as bibfile:
-        bibfile.write(writer.write(db))
+    Entries go to a temporary file next to the output, which replaces the output
+    only once the with block completes; an interrupted run leaves the output of
+    the previous run untouched. The progress log is only appended to, and is
+    compacted to the records of this run once it completes.
+    """
+    
+    def __init__(self, filepath: str, progress_path: Optional[str] = None):
+        """
+        Start writing the output file.
+        
+        Args:
+            filepath: Path to the output .bib file
+            progress_path: Optional JSON lines file recording the ID, resume key, status
+                and fixed entry of each entry written
+        """
+        self.filepath = filepath
+        self.progress_path = progress_path
+        self._partial_path = f"{filepath}.partial"
+        self._file = open(self._partial_path, 'w', encoding='utf-8')
+        self._progress = open(progress_path, 'a', encoding='utf-8') if progress_path else None
+        self._records = []
+        self._writer = _make_writer()
+        self.count = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+        if self._progress:
+            self._progress.close()
+        if exc_type is None:
+            os.replace(self._partial_path, self.filepath)
+            if self.progress_path:
+                self._compact_progress()
+    
+    def _compact_progress(self):
+        """Drop the records of earlier runs from the progress log."""
+        compacted_path = f"{self.progress_path}.tmp"
+        with open(compacted_path, 'w', encoding='utf-8') as compacted:
+            compacted.writelines(self._records)
+            self._sync(compacted)
+        os.replace(compacted_path, self.progress_path)
+    
+    def write(self, entry: Dict, status: str = 'ok', key: Optional[str] = None):
+        """
+        Append an entry to the file and sync it to disk.
+        
+        Args:
+            entry: BibTeX entry dictionary
+            status: 'ok' for a fixed entry, 'fallback' for an entry kept as it was
+            key: Resume key of the input entry, as made by _resume_key
+        """
+        db = bibtexparser.bibdatabase.BibDatabase()
+        db.entries = [entry]
+        if self.count:
+            self._file.write(self._writer.entry_separator)
+        self._file.write(self._writer.write(db))
+        self._sync(self._file)
+        
+        # Fixed entries are kept in the log, which unlike the output survives
+        # being interrupted again while resuming
+        if self._progress:
+            record = {"id": entry.get('ID'), "key": key, "status": status}
+            if status == 'ok':
+                record["entry"] = entry
+            line = json.dumps(record) + '\n'
+            self._progress.write(line)
+            self._sync(self._progress)
+            self._records.append(line)
+        self.count += 1
+    
+    @staticmethod
+    def _sync(file):
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _progress_path(output_file: str) -> str:
+    """Path of the progress log kept next to an output file."""
+    return f"{output_file}.processed.jsonl"
+
+
+def _resume_key(entry: Dict, style: str) -> str:
+    """Key of an input entry fixed in a given style, which changes when the entry is edited."""
+    return Cache.make_key(style, json.dumps(entry, sort_keys=True))
+
+
+def _read_previous_output(output_file: str) -> Dict[str, Dict]:
+    """
+    Read the entries fixed by earlier, possibly interrupted, runs.
+    
+    Entries come from the progress log, whose latest record for each entry
+    counts; entries that kept their original citation (e.g. because Scholar
+    asked for a CAPTCHA) are retried.
+    
+    Args:
+        output_file: Path to the output .bib file
+        
+    Returns:
+        Dictionary mapping resume keys (see _resume_key) to the entries already fixed
+    """
+    previous = {}
+    progress_file = _progress_path(output_file)
+    if not os.path.exists(progress_file):
+        return previous
+    
+    with open(progress_file, 'r', encoding='utf-8') as progress:
+        for line in progress:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Last line of a run killed while writing it
+                continue
+            # Records without a key come from older versions and are not reused
+            if not record.get('key'):
+                continue
+            if record.get('status') == 'ok' and record.get('entry'):
+                previous[record['key']] = record['entry']
+            else:
+                previous.pop(record['key'], None)
+    return previous
+
+
+def _parse_reformatted(reformatted: str,
+                       parser: Optional[BibTexParser] = None) -> Optional[Dict]:
+    """
+    Parse the first entry of an LLM-reformatted citation.
+    
+    Args:
+        reformatted: Reformatted BibTeX string
+        parser: Parser reused for unusual output (created if not given)
+        
+    Returns:
+        The parsed entry, or None if the text contains no usable entry
+    """
+    # Use the full parser only for unusual output
+    try:
+        blocks = _iter_bibtex_blocks(reformatted.splitlines(keepends=True))
+        new_entry = _parse_simple_entry(next(blocks, ''))
+        if new_entry is None:
+            parsed = _parse_with(parser or _make_parser(), reformatted)
+            new_entry = parsed[0] if parsed else None
+        return new_entry
+    except Exception as e:
+        logger.debug(f"Could not parse reformatted entry: {e}")
+        return None
+
+
+def _apply_reformatted(entry: Dict, reformatted: Optional[str],
+                       parser: Optional[BibTexParser] = None) -> Dict:
+    """
+    Parse an LLM-reformatted citation, keeping the ID of the original entry.
+    
+    Args:
+        entry: Original BibTeX entry dictionary
+        reformatted: Reformatted BibTeX string, or None if reformatting failed
+        parser: Parser reused for unusual output (created if not given)
+        
+    Returns:
+        The reformatted entry, or the original entry if it cannot be used
+    """
+    entry_id = entry.get('ID', 'unknown')
+    if not reformatted:
+        logger.info(f"Could not reformat {entry_id}, using original")
+        return entry
+    
+    new_entry = _parse_reformatted(reformatted, parser)
+    if new_entry is None:
+        logger.info(f"Could not parse reformatted entry for {entry_id}, using original")
+        return entry
+    
+    # Preserve the original entry ID if possible
+    new_entry['ID'] = entry_id
+    logger.debug(f"Successfully reformatted {entry_id}")
+    return new_entry
+
+
+def _paper_keys(entry: Dict) -> List[tuple]:
+    """
+    Keys identifying the paper an entry cites: its DOI, and its title together
+    with its first author's surname (or, without authors, its year).
+    """
+    keys = []
+    doi = entry.get('doi', '').strip().lower()
+    if doi:
+        keys.append(('doi', doi))
+    title = re.sub(r'\W+', '', clean_latex(entry.get('title', '')).lower())
+    surname = re.sub(r'\W+', '', first_author_surname(entry.get('author')).lower())
+    if title and surname:
+        keys.append(('title-author', title, surname))
+    elif title and entry.get('year'):
+        keys.append(('title-year', title, entry['year'].strip()))
+    return keys
+
+
+class _PaperIndex:
+    """
+    Maps entries citing the same paper to one value, such as a single search.
+    
+    Entries cite the same paper if they share a DOI, or the same title and first
+    author; entries with different DOIs never do.
+    """
+    
+    def __init__(self):
+        self._papers = {}
+        self.count = 0
+    
+    def setdefault(self, entry: Dict, create: Callable[[], object]) -> object:
+        """
+        Return the value of an earlier entry citing the same paper as entry.
+        
+        Args:
+            entry: BibTeX entry dictionary
+            create: Called to make the value if no earlier entry cites the paper
+        """
+        doi = entry.get('doi', '').strip().lower()
+        keys = _paper_keys(entry)
+        paper = next((
+            paper for paper in map(self._papers.get, keys)
+            if paper and not (doi and paper['doi'] and paper['doi'] != doi)
+        ), None)
+        
+        if paper is None:
+            paper = {'doi': doi, 'value': create()}
+            self.count += 1
+        elif not paper['doi']:
+            paper['doi'] = doi
+        for key in keys:
+            self._papers.setdefault(key, paper)
+        return paper['value']
 
 
 def process_bibtex(input_file: str, output_file: str, style: str = "standard", 
-                   api_key: Optional[str] = None, headless: bool = True):
+                   api_key: Optional[str] = None, headless: bool = True,
+                   workers: int = 4, use_cache: bool = True,
+                   batch_size: int = LLM_BATCH_SIZE, llm_workers: int = LLM_WORKERS,
+                   cache_path=DEFAULT_CACHE_PATH,
+                   cache_ttl_days: float = SCHOLAR_CACHE_TTL_DAYS,
+                   use_crossref: bool = True, resume: bool = True,
+                   use_daemon: bool = True):
     """
     Process a BibTeX file: search for entries, select best versions, and reformat.
     
@@ -467,70 +1896,206 @@ def process_bibtex(input_file: str, output_file: str, style: str = "standard",
         style: Citation style to use
         api_key: OpenRouter API key (if None, reads from environment)
         headless: Whether to run browser in headless mode
+        workers: Number of browsers searching Google Scholar concurrently
+        use_cache: Whether to reuse citations and LLM responses from previous runs
+        batch_size: Number of entries reformatted per LLM request
+        llm_workers: Number of LLM requests in flight at the same time
+        cache_path: Path to the SQLite cache database
+        cache_ttl_days: Days after which cached citations are searched again
+        use_crossref: Whether to look entries up on Crossref before searching Google Scholar
+        resume: Whether to keep the entries fixed by an earlier run into the same output
+            file, unless they were edited or the style changed since
+        use_daemon: Whether to search Google Scholar through a running fixtex daemon
     """
     # Get API key
     if api_key is None:
         api_key = os.getenv('OPENROUTER_API_KEY')
     
     if not api_key:
-        print("Error: OPENROUTER_API_KEY not found in environment or provided as argument")
+        logger.error("OPENROUTER_API_KEY not found in environment or provided as argument")
         sys.exit(1)
     
-    # Parse input file
-    print(f"Reading BibTeX file: {input_file}")
-    entries = parse_bibtex_file(input_file)
-    print(f"Found {len(entries)} entries")
+    # Entries already fixed by an earlier run are kept instead of processed again
+    previous = _read_previous_output(output_file) if resume else {}
     
-    # Initialize scraper and reformatter
-    reformatter = LLMReformatter(api_key)
-    fixed_entries = []
+    # Be nice to Google Scholar: all browsers share one request budget
+    rate_limiter = RateLimiter(SCHOLAR_REQUEST_INTERVAL, SCHOLAR_REQUEST_JITTER)
+    workers = max(1, workers)
+    batch_size = max(1, batch_size)
     
-    with ScholarScraper(headless=headless, llm_reformatter=reformatter) as scraper:
-        for i, entry in enumerate(entries, 1):
-            entry_id = entry.get('ID', 'unknown')
-            print(f"\n[{i}/{len(entries)}] Processing entry: {entry_id}")
-            
-            # Search for the entry on Google Scholar
-            citation = scraper.search_entry(entry)
-            
+    with ExitStack() as stack:
+        cache = None
+        if use_cache:
+            cache = stack.enter_context(Cache(cache_path, scholar_ttl=cache_ttl_days * 24 * 60 * 60))
+        # Requests come from the LLM workers and, for version selection, the browsers
+        reformatter = stack.enter_context(LLMReformatter(
+            api_key,
+            cache=cache,
+            max_connections=max(1, llm_workers) + max(1, workers),
+            batch_size=batch_size
+        ))
+        
+        # The pool is entered before the executor, so browsers are closed after all searches
+        pool = stack.enter_context(ScholarScraperPool(
+            workers,
+            headless=headless,
+            llm_reformatter=reformatter,
+            rate_limiter=rate_limiter,
+            cache=cache
+        ))
+        crossref = None
+        if use_crossref:
+            crossref = stack.enter_context(CrossrefClient(
+                cache=cache,
+                mailto=os.getenv('CROSSREF_MAILTO'),
+                max_connections=workers
+            ))
+        
+        daemon = None
+        if use_daemon and DAEMON_SOCKET_PATH.exists():
+            settings = _daemon_settings(headless, use_cache, cache_path, cache_ttl_days)
+            try:
+                daemon = stack.enter_context(ScraperDaemonClient(DAEMON_SOCKET_PATH))
+                daemon_settings = daemon.settings() or {}
+            except (OSError, EOFError) as e:
+                logger.warning(f"Could not connect to the fixtex daemon ({e}), starting browsers")
+                daemon = None
+            else:
+                different = [name for name in settings if daemon_settings.get(name) != settings[name]]
+                if different:
+                    logger.info(f"The fixtex daemon on {DAEMON_SOCKET_PATH} runs with a different "
+                                f"{', '.join(different)}, starting browsers")
+                    daemon = None
+                else:
+                    logger.info(f"Searching Google Scholar with the fixtex daemon on {DAEMON_SOCKET_PATH}")
+        
+        def search_entry(entry: Dict) -> Optional[str]:
+            # Browsers are only started for entries Crossref cannot match
+            citation = crossref.search_entry(entry) if crossref else None
             if citation:
-                print(f"Found citation for {entry_id}")
-                
-                # Reformat with LLM
-                print(f"Reformatting with LLM...")
-                reformatted = reformatter.reformat(citation, style)
+                return citation
+            if daemon:
+                try:
+                    return daemon.search_entry(entry)
+                except (OSError, EOFError, RuntimeError) as e:
+                    logger.warning(f"fixtex daemon failed ({e}), searching without it")
+            return pool.search_entry(entry)
+        
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+        llm_executor = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, llm_workers)))
+        
+        # Leaving the executors waits for all submitted work, so on errors and Ctrl+C
+        # cancel the searches and LLM requests that have not started yet
+        searches = []
+        pending = collections.deque()
+        
+        def cancel_queued():
+            for future in searches:
+                future.cancel()
+            for _, reformatted_batch in pending:
+                reformatted_batch.cancel()
+        
+        stack.callback(cancel_queued)
+        output = stack.enter_context(BibTeXStreamWriter(output_file, _progress_path(output_file)))
+        
+        # Parse input file; searches start while later entries are still being read
+        logger.info(f"Reading BibTeX file: {input_file}")
+        entries = []
+        papers = _PaperIndex()
+        skipped = Future()
+        skipped.set_result(None)
+        
+        resumed = 0
+        for entry in iter_bibtex_entries(input_file):
+            entries.append(entry)
+            if _resume_key(entry, style) in previous:
+                searches.append(skipped)
+                resumed += 1
+                continue
+            
+            # Entries for the same paper (e.g. preprint and camera-ready keys) share one search
+            searches.append(papers.setdefault(entry, lambda: executor.submit(search_entry, entry)))
+        
+        logger.info(f"Found {len(entries)} entries ({papers.count} distinct searches)")
+        if resumed:
+            logger.info(f"Resuming: {resumed} entries already fixed in {output_file}")
+        citations = (future.result() for future in searches)
+        
+        # Disabled when stderr is not a terminal, e.g. when output is redirected to a file
+        progress = stack.enter_context(tqdm(total=len(entries), desc='fixtex', unit='entry',
+                                            disable=None))
+        kept = 0
+        # Only used by write_batch, which always runs on this thread
+        parser = _make_parser()
+        
+        def write_batch(batch: List, reformatted_batch) -> None:
+            nonlocal kept
+            reformatted = iter(reformatted_batch.result())
+            for entry, citation in batch:
+                entry_id = entry.get('ID', 'unknown')
+                key = _resume_key(entry, style)
+                logger.debug(f"[{output.count + 1}/{len(entries)}] Processing entry: {entry_id}")
                 
-                if reformatted:
-                    # Parse the reformatted BibTeX
-                    try:
-                        parser = BibTexParser()
-                        parsed = bibtexparser.loads(reformatted, parser=parser)
-                        if parsed.entries:
-                            # Preserve the original entry ID if possible
-                            new_entry = parsed.entries[0]
-                            new_entry['ID'] = entry_id
-                            fixed_entries.append(new_entry)
-                            print(f"Successfully reformatted {entry_id}")
-                        else:
-                            print(f"Warning: Could not parse reformatted entry for {entry_id}, using original")
-                            fixed_entries.append(entry)
-                    except Exception as e:
-                        print(f"Error parsing reformatted entry: {e}, using original")
-                        fixed_entries.append(entry)
+                if key in previous:
+                    logger.debug(f"Already processed {entry_id}, keeping it")
+                    output.write(previous[key], key=key)
+                elif citation:
+                    logger.debug(f"Found citation for {entry_id}")
+                    new_entry = _apply_reformatted(entry, next(reformatted), parser)
+                    if new_entry is entry:
+                        kept += 1
+                    output.write(new_entry, 'ok' if new_entry is not entry else 'fallback', key)
                 else:
-                    print(f"Warning: Could not reformat {entry_id}, using original")
-                    fixed_entries.append(entry)
-            else:
-                print(f"Warning: Could not find citation for {entry_id}, using original")
-                fixed_entries.append(entry)
+                    logger.info(f"Could not find citation for {entry_id}, using original")
+                    kept += 1
+                    output.write(entry, 'fallback', key)
+                progress.update()
+        
+        # Results come back in input order while later entries are still being searched
+        results = zip(entries, citations)
+        while True:
+            batch = list(itertools.islice(results, batch_size))
+            if not batch:
+                break
+            
+            # Reformat all citations found in this batch with one LLM request, in the
+            # background so the next batches keep being searched meanwhile
+            found = [citation for _, citation in batch if citation]
+            if found:
+                logger.debug(f"Reformatting {len(found)} entries with LLM...")
+            pending.append((batch, llm_executor.submit(reformatter.reformat_batch, found, style)))
             
-            # Be nice to Google Scholar
-            time.sleep(3)
+            # Write finished batches in input order
+            while pending and pending[0][1].done():
+                write_batch(*pending.popleft())
+        
+        while pending:
+            write_batch(*pending.popleft())
     
-    # Write output file
-    print(f"\nWriting results to: {output_file}")
-    write_bibtex_file(output_file, fixed_entries)
-    print(f"Done! Processed {len(fixed_entries)} entries")
+    logger.info(f"Done! Wrote {output.count} entries to {output_file} "
+                f"({output.count - kept} fixed, {kept} kept as they were)")
+
+
+class _TqdmLoggingHandler(logging.Handler):
+    """Writes log messages above the progress bar instead of through it."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        if record.levelno >= logging.WARNING:
+            message = f"{record.levelname.capitalize()}: {message}"
+        return message
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            tqdm.write(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+def _configure_logging(verbose: bool = False):
+    """Show fixtex's log messages on the console, all of them if verbose."""
+    logger.addHandler(_TqdmLoggingHandler())
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
 
 def main():
@@ -541,6 +2106,7 @@ def main():
     parser.add_argument(
         'input',
         type=str,
+        nargs='?',
         help='Input .bib file'
     )
     parser.add_argument(
@@ -564,8 +2130,76 @@ def main():
         action='store_true',
         help='Run browser in non-headless mode (visible)'
     )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=4,
+        help='Number of browsers searching Google Scholar concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore citations and LLM responses cached by previous runs'
+    )
+    parser.add_argument(
+        '--cache-path',
+        type=str,
+        default=str(DEFAULT_CACHE_PATH),
+        help=f'Cache database file (default: {DEFAULT_CACHE_PATH})'
+    )
+    parser.add_argument(
+        '--cache-ttl-days',
+        type=float,
+        default=SCHOLAR_CACHE_TTL_DAYS,
+        help=f'Days after which cached citations are searched again (default: {SCHOLAR_CACHE_TTL_DAYS})'
+    )
+    parser.add_argument(
+        '--no-crossref',
+        action='store_true',
+        help='Search every entry on Google Scholar instead of trying Crossref first'
+    )
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='Process all entries again instead of keeping those fixed by an earlier run'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep browsers running in the background for later runs, until stopped with Ctrl+C'
+    )
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Start browsers for this run even if a fixtex daemon is running'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Show the progress of every search and LLM request'
+    )
+    parser.add_argument(
+        '-b', '--batch-size',
+        type=int,
+        default=LLM_BATCH_SIZE,
+        help=f'Number of entries reformatted per LLM request (default: {LLM_BATCH_SIZE})'
+    )
     
     args = parser.parse_args()
+    _configure_logging(args.verbose)
+    
+    if args.daemon:
+        serve_scrapers(
+            api_key=args.api_key,
+            headless=not args.no_headless,
+            use_cache=not args.no_cache,
+            cache_path=args.cache_path,
+            cache_ttl_days=args.cache_ttl_days
+        )
+        return
+    
+    if not args.input:
+        parser.error("the input file is required unless --daemon is given")
     
     # Determine output file
     if args.output:
@@ -576,7 +2210,7 @@ def main():
     
     # Check if input file exists
     if not os.path.exists(args.input):
-        print(f"Error: Input file not found: {args.input}")
+        logger.error(f"Input file not found: {args.input}")
         sys.exit(1)
     
     # Process the BibTeX file
@@ -585,7 +2219,15 @@ def main():
         output_file,
         args.style,
         args.api_key,
-        headless=not args.no_headless
+        headless=not args.no_headless,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+        cache_path=args.cache_path,
+        cache_ttl_days=args.cache_ttl_days,
+        batch_size=max(1, args.batch_size),
+        use_crossref=not args.no_crossref,
+        resume=not args.no_resume,
+        use_daemon=not args.no_daemon
     )
 
 
@@ -91,6 +91,181 @@ except Exception as e:
     print(f"✗ Failed to initialize LLMReformatter: {e}")
     sys.exit(1)
 
+# Test fixtex's own BibTeX parser
+print("\nTesting fixtex BibTeX parsing...")
+try:
+    entries = fixtex.parse_bibtex_file('example.bib')
+    assert entries == bib.entries, "parsed entries differ from bibtexparser"
+    print(f"✓ parse_bibtex_file matches bibtexparser on {len(entries)} entries")
+except Exception as e:
+    print(f"✗ Failed to parse BibTeX with fixtex: {e}")
+    sys.exit(1)
+
+# Test LaTeX cleanup for search queries
+print("\nTesting LaTeX cleanup...")
+try:
+    assert fixtex.clean_latex("{BERT}: \\emph{Pre-training} of {\\L}ukasz") == "BERT: Pre-training of Lukasz"
+    assert fixtex.clean_latex("\\textbf{\\textit{Nested}} Caf\\'{e}") == "Nested Cafe"
+    assert fixtex.clean_latex("Q\\&A for 1990--2000~\\textit{R\\&D}") == "Q&A for 1990-2000 R&D"
+    print("✓ LaTeX commands, accents, escapes and braces removed")
+except Exception as e:
+    print(f"✗ LaTeX cleanup test failed: {e}")
+    sys.exit(1)
+
+# Test grouping of entries citing the same paper
+print("\nTesting duplicate detection...")
+try:
+    papers = fixtex._PaperIndex()
+    group = lambda entry: papers.setdefault(entry, lambda: entry['ID'])
+    assert group({'ID': 'lecun', 'title': 'Deep learning', 'author': 'LeCun, Yann',
+                  'doi': '10.1038/nature14539'}) == 'lecun'
+    assert group({'ID': 'goodfellow', 'title': 'Deep Learning', 'author': 'Ian Goodfellow'}) == 'goodfellow'
+    assert group({'ID': 'lecun2', 'title': 'Deep {L}earning', 'author': 'Y. LeCun'}) == 'lecun'
+    assert group({'ID': 'lecun3', 'title': 'Deep learning', 'author': 'LeCun, Y.',
+                  'doi': '10.1000/other'}) == 'lecun3'
+    assert group({'ID': 'nature', 'title': 'Deep learning (Nature)', 'doi': '10.1038/NATURE14539'}) == 'lecun'
+    assert group({'ID': 'intro', 'title': 'Introduction'}) == 'intro'
+    assert group({'ID': 'intro2', 'title': 'Introduction'}) == 'intro2'
+    print("✓ Entries are grouped by DOI or title and first author, never across DOIs")
+except Exception as e:
+    print(f"✗ Duplicate detection test failed: {e}")
+    sys.exit(1)
+
+# Test selection of Crossref works
+print("\nTesting Crossref matching...")
+try:
+    select = fixtex.CrossrefClient._select_match
+    nature = {'type': 'journal-article', 'title': ['Deep learning'], 'container-title': ['Nature'],
+              'author': [{'given': 'Yann', 'family': 'LeCun', 'sequence': 'first'}],
+              'issued': {'date-parts': [[2015, 5]]}}
+    book = {'type': 'book', 'title': ['Deep Learning'],
+            'author': [{'given': 'Ian', 'family': 'Goodfellow', 'sequence': 'first'}],
+            'issued': {'date-parts': [[2016]]}}
+    goodfellow = {'ID': 'goodfellow', 'title': 'Deep Learning', 'author': 'Goodfellow, Ian', 'year': '2016'}
+    assert select(goodfellow, [nature, book]) is book
+    assert select({'ID': 'lecun', 'title': 'Deep learning', 'author': 'Yann LeCun'}, [nature, book]) is nature
+    assert select(dict(goodfellow, year='2019'), [nature, book]) is None
+    assert select({'ID': 'x', 'title': 'Deep learning', 'author': 'M{\\"u}ller, J'},
+                  [dict(nature, author=[{'family': 'Müller'}])]) is not None
+    print("✓ Works must match the entry's title, first author and year")
+    bibtex = fixtex.CrossrefClient._to_bibtex(
+        {'type': 'journal-article', 'title': ['Reaching 99% on x_1 & $5 #1']}, 'k')
+    assert 'title = {Reaching 99\\% on x\\_1 \\& \\$5 \\#1}' in bibtex
+    print("✓ Special characters are escaped in BibTeX built from Crossref")
+except Exception as e:
+    print(f"✗ Crossref matching test failed: {e}")
+    sys.exit(1)
+
+# Test extraction of BibTeX from LLM responses
+print("\nTesting code block extraction...")
+try:
+    extract = fixtex.LLMReformatter._extract_code_block
+    assert extract("Sure:\n```bibtex\n@article{a}\n```\nDone.").strip() == "@article{a}"
+    assert extract("```\n@article{a}\n```").strip() == "@article{a}"
+    assert extract("@article{a}") == "@article{a}"
+    print("✓ BibTeX extracted from markdown code blocks")
+except Exception as e:
+    print(f"✗ Code block extraction test failed: {e}")
+    sys.exit(1)
+
+# Test Cache round trip
+print("\nTesting Cache...")
+try:
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with fixtex.Cache(Path(tmpdir) / "cache.sqlite") as cache:
+            assert cache.get_scholar("Attention is all you need") is None
+            cache.put_scholar("Attention  is all you NEED", "@article{a, title={A}}")
+            assert cache.get_scholar("attention is all you need") == "@article{a, title={A}}"
+            print("✓ Scholar citations are cached by normalized query")
+            key = fixtex.Cache.make_key("model", "standard", "@article{a}")
+            cache.put_llm(key, "@article{b}")
+            assert cache.get_llm(key) == "@article{b}"
+            print("✓ LLM responses are cached by key")
+except Exception as e:
+    print(f"✗ Cache test failed: {e}")
+    sys.exit(1)
+
+# Test that only usable LLM replies are cached
+print("\nTesting LLM caching...")
+try:
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with fixtex.Cache(Path(tmpdir) / "cache.sqlite") as cache:
+            reformatter = fixtex.LLMReformatter("test_key", model="test_model", cache=cache)
+            replies = ["Sorry, I can't do that.", "@article{x, title={Fixed}}"]
+            reformatter._complete = lambda instructions, prompt, json_response=False: replies.pop(0)
+            assert reformatter.reformat("@article{a, title={A}}") == "Sorry, I can't do that."
+            assert reformatter.reformat("@article{a, title={A}}") == "@article{x, title={Fixed}}"
+            assert reformatter.reformat("@article{a, title={A}}") == "@article{x, title={Fixed}}"
+            print("✓ Unparseable reformatting replies are retried, parsed ones cached")
+            
+            versions = [{'index': 0, 'title': 'T', 'info': 'I', 'snippet': ''}]
+            replies = ["I cannot tell.", "Version 0"]
+            assert reformatter.select_best_version(versions) is None
+            assert reformatter.select_best_version(versions) == 0
+            assert reformatter.select_best_version(versions) == 0
+            print("✓ Selection replies without an index are retried")
+except Exception as e:
+    print(f"✗ LLM caching test failed: {e}")
+    sys.exit(1)
+
+# Test that an interrupted run keeps the previous output
+print("\nTesting output writing...")
+try:
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = str(Path(tmpdir) / "out.bib")
+        with fixtex.BibTeXStreamWriter(output_file) as output:
+            output.write({'ENTRYTYPE': 'article', 'ID': 'e1', 'title': 'One'})
+            output.write({'ENTRYTYPE': 'article', 'ID': 'e2', 'title': 'Two'})
+        try:
+            with fixtex.BibTeXStreamWriter(output_file) as output:
+                output.write({'ENTRYTYPE': 'article', 'ID': 'e1', 'title': 'One again'})
+                raise RuntimeError("browser failed to start")
+        except RuntimeError:
+            pass
+        entries = fixtex.parse_bibtex_file(output_file)
+        assert [(e['ID'], e['title']) for e in entries] == [('e1', 'One'), ('e2', 'Two')]
+        print("✓ Output is only replaced once a run completes")
+
+        # A run fixes e1 but not e2, then two resumed runs crash
+        progress_path = fixtex._progress_path(output_file)
+        e1 = {'ENTRYTYPE': 'article', 'ID': 'e1', 'title': 'Fixed one'}
+        e2 = {'ENTRYTYPE': 'article', 'ID': 'e2', 'title': 'Two'}
+        key1 = fixtex._resume_key({'ENTRYTYPE': 'article', 'ID': 'e1', 'title': 'One'}, 'standard')
+        key2 = fixtex._resume_key(e2, 'standard')
+        with fixtex.BibTeXStreamWriter(output_file, progress_path) as output:
+            output.write(e1, key=key1)
+            output.write(e2, 'fallback', key2)
+        assert fixtex._read_previous_output(output_file) == {key1: e1}
+        for fixed in ([], [e1, dict(e2, title='Fixed two')]):
+            try:
+                with fixtex.BibTeXStreamWriter(output_file, progress_path) as output:
+                    for entry, key in zip(fixed, (key1, key2)):
+                        output.write(entry, key=key)
+                    raise RuntimeError("browser failed to start")
+            except RuntimeError:
+                pass
+        previous = fixtex._read_previous_output(output_file)
+        assert previous == {key1: e1, key2: dict(e2, title='Fixed two')}
+        print("✓ Fixed entries survive crashes of resumed runs")
+        
+        edited = fixtex._resume_key({'ENTRYTYPE': 'article', 'ID': 'e1', 'title': 'Won'}, 'standard')
+        restyled = fixtex._resume_key({'ENTRYTYPE': 'article', 'ID': 'e1', 'title': 'One'}, 'ieee')
+        assert edited not in previous and restyled not in previous
+        print("✓ Edited entries and style changes are processed again")
+        
+        with fixtex.BibTeXStreamWriter(output_file, progress_path) as output:
+            output.write(previous[key1], key=key1)
+            output.write(previous[key2], key=key2)
+        with open(progress_path, encoding='utf-8') as progress:
+            assert len(progress.readlines()) == 2
+        print("✓ Progress log is compacted once a run completes")
+except Exception as e:
+    print(f"✗ Output writing test failed: {e}")
+    sys.exit(1)
+
 print("\n" + "="*50)
 print("All basic tests passed! ✓")
 print("="*50)